@@ -150,12 +150,12 @@ You can install plugins to [{plugins.__path__[0]}]().
 """,
     )
 
-    regex = r"\[(.+?)\]\((.*?)\)"
+    regex = re.compile(r"\[(.+?)\]\((.*?)\)")
     textutils.LinkManager(textwidget, regex, get_link_opener).add_links("1.0", "end")
 
     ranges = textwidget.tag_ranges("link")
     for start, end in reversed(list(zip(ranges[0::2], ranges[1::2]))):
-        match = re.fullmatch(regex, textwidget.get(start, end))
+        match = regex.fullmatch(textwidget.get(start, end))
         assert match
         textwidget.replace(start, end, match.group(1), textwidget.tag_names(start))
 
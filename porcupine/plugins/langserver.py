@@ -5,16 +5,17 @@ from __future__ import annotations
 
 import dataclasses
 import itertools
+import json
 import logging
 import os
 import pprint
 import queue
-import re
 import signal
 import subprocess
 import sys
 import threading
-from collections.abc import Iterator
+import tkinter
+from collections.abc import Callable, Iterator
 from functools import partial
 from pathlib import Path
 from typing import IO, Any, Optional
@@ -24,12 +25,33 @@ if sys.platform != "win32":
     import fcntl
 
 import sansio_lsp_client as lsp
+import sansio_lsp_client.io_handler
 
 from porcupine import get_tab_manager, tabs, textutils, utils
 from porcupine.plugins import autocomplete, hover, jump_to_definition, python_venv, underlines
 
 global_log = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    pass
+else:
+    # Completion responses can be megabytes of JSON. The json module is slow for
+    # that, so make sansio-lsp-client use orjson when it is installed.
+    class _FasterJSON:
+        dumps = staticmethod(json.dumps)
+
+        @staticmethod
+        def loads(string: str) -> Any:
+            try:
+                return orjson.loads(string)
+            except orjson.JSONDecodeError:
+                # orjson is stricter, e.g. it doesn't support NaN or huge integers
+                return json.loads(string)
+
+    sansio_lsp_client.io_handler.json = _FasterJSON  # type: ignore
+
 # Before autocomplete: use this plugin's autocompleter, so must bind first
 # After underlines: when hovering something underlined, don't ask langserver what to show
 # After python_venv: needed for python_venv.get_venv() to work
@@ -48,13 +70,17 @@ class NonBlockingIO:
 
         # Reads can obviously block, but flushing can block too, see #635
         # Nonblock flags don't help with writing, it raises error if it would block
-        self._write_queue: queue.Queue[bytes] = queue.Queue()
-        threading.Thread(target=self._write_queue_to_stdin, daemon=True).start()
+        #
+        # The writing thread swaps the buffer with an empty one and writes the
+        # old buffer, so that write() can keep appending while that happens.
+        self._write_buffer = bytearray()
+        self._write_condition = threading.Condition()
+        threading.Thread(target=self._write_buffer_to_stdin, daemon=True).start()
 
         if sys.platform == "win32":
             self._read_queue: queue.Queue[bytes] = queue.Queue()
-            self._reader_thread = threading.Thread(target=self._stdout_to_read_queue, daemon=True)
-            self._reader_thread.start()
+            self._got_eof = False
+            threading.Thread(target=self._stdout_to_read_queue, daemon=True).start()
         else:
             # this works because we don't use .readline()
             # https://stackoverflow.com/a/1810703
@@ -64,34 +90,35 @@ class NonBlockingIO:
             new_flags = old_flags | os.O_NONBLOCK
             fcntl.fcntl(fileno, fcntl.F_SETFL, new_flags)
 
-    def _write_queue_to_stdin(self) -> None:
+    def _write_buffer_to_stdin(self) -> None:
         while self._process.poll() is None:
-            # Why timeout: if process dies and no more to write, stop soon
-            try:
-                chunk = self._write_queue.get(timeout=5)
-            except queue.Empty:  # timed out
-                continue
+            with self._write_condition:
+                # Why timeout: if process dies and no more to write, stop soon
+                if not self._write_condition.wait_for(lambda: self._write_buffer, timeout=5):
+                    continue
+                bytez = self._write_buffer
+                self._write_buffer = bytearray()
 
             # Process can exit while waiting, but clean shutdown involves
             # writing messages before the process exits, so here it should
             # be still alive
             assert self._process.stdin is not None
-            self._process.stdin.write(chunk)
+            self._process.stdin.write(bytez)
             self._process.stdin.flush()
 
     if sys.platform == "win32":
 
         def _stdout_to_read_queue(self) -> None:
+            assert self._process.stdout is not None
+            fileno = self._process.stdout.fileno()
             while True:
-                # for whatever reason, nothing works unless i go ONE BYTE at a
-                # time.... this is a piece of shit
-                #
-                # TODO: read1() method?
-                assert self._process.stdout is not None
-                one_fucking_byte = self._process.stdout.read(1)
-                if not one_fucking_byte:
+                # Reading a pipe on windows returns as soon as there's something
+                # to read, so this doesn't wait until CHUNK_SIZE bytes arrive
+                chunk = os.read(fileno, CHUNK_SIZE)
+                self._read_queue.put(chunk)
+                if not chunk:
+                    # Empty bytes object goes to the queue to indicate EOF
                     break
-                self._read_queue.put(one_fucking_byte)
 
     # Return values:
     #   - nonempty bytes object: data was read
@@ -99,23 +126,101 @@ class NonBlockingIO:
     #   - None: no data to read
     def read(self) -> bytes | None:
         if sys.platform == "win32":
-            buf = bytearray()
+            if self._got_eof:
+                return b""
+
+            chunks = []
             while True:
                 try:
-                    buf += self._read_queue.get(block=False)
+                    chunk = self._read_queue.get(block=False)
                 except queue.Empty:
                     break
+                if not chunk:
+                    self._got_eof = True
+                    break
+                chunks.append(chunk)
 
-            if self._reader_thread.is_alive() and not buf:
+            if not chunks and not self._got_eof:
                 return None
-            return bytes(buf)
+            return b"".join(chunks)
 
         else:
+            # Read the file descriptor directly. The BufferedReader of stdout
+            # would only add copying, and it isn't meant for non-blocking use.
             assert self._process.stdout is not None
-            return self._process.stdout.read(CHUNK_SIZE)
+            try:
+                return os.read(self._process.stdout.fileno(), CHUNK_SIZE)
+            except BlockingIOError:
+                return None
+
+    if sys.platform != "win32":
+
+        def fileno(self) -> int:
+            assert self._process.stdout is not None
+            return self._process.stdout.fileno()
 
     def write(self, bytez: bytes) -> None:
-        self._write_queue.put(bytez)
+        with self._write_condition:
+            self._write_buffer += bytez
+            self._write_condition.notify()
+
+
+# sansio-lsp-client copies everything it has received so far whenever it gets
+# more bytes. When a big message arrives in many chunks, that's slow. This
+# class collects chunks into complete messages, so that sansio-lsp-client
+# receives each message at once.
+class _MessageSplitter:
+    def __init__(self) -> None:
+        self._header_buffer = bytearray()
+        self._headers = b""
+        self._content: bytearray | None = None
+        self._content_received = 0
+
+    def _parse_headers(self, headers: bytes) -> int:
+        for header_line in headers.split(b"\r\n"):
+            name, colon, value = header_line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                return int(value)
+        raise ValueError(f"Content-Length header not found: {headers!r}")
+
+    # Yields complete messages, including headers
+    def feed(self, bytez: bytes) -> Iterator[bytes]:
+        if self._header_buffer:
+            # Headers of a message got split between two chunks
+            bytez = bytes(self._header_buffer) + bytez
+            self._header_buffer.clear()
+
+        # Track position in bytez instead of slicing, because slicing would
+        # copy the rest of the chunk for every message in it.
+        view = memoryview(bytez)
+        position = 0
+        while True:
+            if self._content is None:
+                headers_end = bytez.find(b"\r\n\r\n", position)
+                if headers_end == -1:
+                    self._header_buffer += view[position:]
+                    return
+
+                headers_end += len(b"\r\n\r\n")
+                self._headers = bytez[position:headers_end]
+                position = headers_end
+
+                # Allocate space for the whole content at once, instead of growing a buffer
+                self._content = bytearray(self._parse_headers(self._headers))
+                self._content_received = 0
+
+            n = min(len(bytez) - position, len(self._content) - self._content_received)
+            start = self._content_received
+            self._content[start : start + n] = view[position : position + n]
+            self._content_received += n
+            position += n
+
+            if self._content_received < len(self._content):
+                return
+
+            message = self._headers + self._content
+            self._content = None
+            yield message
 
 
 def completion_item_doc_contains_label(doc: str, label: str) -> bool:
@@ -171,14 +276,28 @@ def _position_tk2lsp(tk_position: str | list[int]) -> lsp.Position:
     # this can't use tab.textwidget.index, because it needs to handle text
     # locations that don't exist anymore when text has been deleted
     if isinstance(tk_position, str):
-        line, column = map(int, tk_position.split("."))
+        line_string, dot, column_string = tk_position.partition(".")
+        line = int(line_string)
+        column = int(column_string)
     else:
         line, column = tk_position
 
     # lsp line numbering starts at 0
     # tk line numbering starts at 1
     # both column numberings start at 0
-    return lsp.Position(line=line - 1, character=column)
+    #
+    # This runs for every change, and construct() is much faster than
+    # Position(...) because it skips pydantic's validation.
+    return lsp.Position.construct(line=line - 1, character=column)
+
+
+# Same as len(re.fullmatch(r".*?(\w*)", string).group(1)), but doesn't look at
+# the beginning of a long line
+def _count_trailing_word_chars(string: str) -> int:
+    i = len(string)
+    while i > 0 and (string[i - 1].isalnum() or string[i - 1] == "_"):
+        i -= 1
+    return len(string) - i
 
 
 def _position_lsp2tk(lsp_position: lsp.Position) -> str:
@@ -274,10 +393,49 @@ class LangServer:
         self._hover_requests: dict[lsp.Id, tuple[tabs.FileTab, str]] = {}
 
         self._version_counter = itertools.count()
-        self.tabs_opened: set[tabs.FileTab] = set()
+        # Values are file URIs, needed on every change and request.
+        # If the path of a tab changes, the tab is closed and opened again.
+        self.tabs_opened: dict[tabs.FileTab, str] = {}
+        # Change events are sent when Tk becomes idle, so that typing fast or
+        # doing many changes at once results in only one message per tab.
+        self._pending_changes: dict[tabs.FileTab, list[lsp.TextDocumentContentChangeEvent]] = {}
         self._is_shutting_down_cleanly = False
+        self._stdout_closed = False
+        self._initialized = False
+
+        # Parsing a big response (e.g. lots of completions) is slow, so it
+        # happens in a separate thread. The lock is needed because the thread
+        # and the rest of this class both use the same sansio-lsp-client object.
+        self._lsp_client_lock = threading.Lock()
+        # Calls of sansio-lsp-client methods that the GUI wants to do. They wait
+        # here while the thread holds the lock, so that the GUI doesn't freeze.
+        self._client_calls: list[Callable[[], object]] = []
+        self._received_queue: queue.Queue[bytes] = queue.Queue()
+        self._message_splitter = _MessageSplitter()
+        # None means that the thread is done with one chunk of received bytes
+        self._event_queue: queue.Queue[lsp.Event | None] = queue.Queue()
+        self._chunks_being_parsed = 0
+        self._parsed_events_check_pending = False
+        self._send_retry_pending = False
 
         self._io = NonBlockingIO(process)
+        self._wakeup_read: int | None = None
+        self._wakeup_write: int | None = None
+        if sys.platform != "win32":
+            # Handle responses as soon as they arrive, instead of waiting for run_stuff()
+            get_tab_manager().tk.createfilehandler(
+                self._io.fileno(), tkinter.READABLE, self._on_stdout_readable
+            )
+            # The thread writes to this pipe when it has parsed something
+            self._wakeup_read, self._wakeup_write = os.pipe()
+            os.set_blocking(self._wakeup_read, False)
+            os.set_blocking(self._wakeup_write, False)
+            get_tab_manager().tk.createfilehandler(
+                self._wakeup_read, tkinter.READABLE, self._on_wakeup_pipe_readable
+            )
+
+        threading.Thread(target=self._parse_received_bytes, daemon=True).start()
+        self._send_queued_messages()  # the initialize request
 
     def __repr__(self) -> str:
         return (
@@ -333,9 +491,132 @@ class LangServer:
 
         self._get_removed_from_langservers()
 
+    def _is_ready(self) -> bool:
+        # The parsing thread changes the state before the Initialized event is
+        # handled. Until then, the langserver doesn't know about opened tabs.
+        return self._initialized and self._lsp_client.state == lsp.ClientState.NORMAL
+
+    def _call_client(self, func: Callable[[], object]) -> None:
+        self._client_calls.append(func)
+        self._send_queued_messages()
+
+    # The parsing thread can hold the lock for a long time when it parses a big
+    # response, and waiting for it would freeze the GUI. Instead, try again later.
+    def _send_queued_messages(self) -> None:
+        if not self._lsp_client_lock.acquire(blocking=False):
+            if not self._send_retry_pending:
+                self._send_retry_pending = True
+                get_tab_manager().after(10, self._retry_sending)
+            return
+
+        try:
+            while self._client_calls:
+                self._client_calls.pop(0)()
+            bytez = self._lsp_client.send()
+        finally:
+            self._lsp_client_lock.release()
+        if bytez:
+            self._io.write(bytez)
+
+    def _retry_sending(self) -> None:
+        self._send_retry_pending = False
+        self._send_queued_messages()
+
+    # Runs in a separate thread. Does not touch tkinter.
+    def _parse_received_bytes(self) -> None:
+        try:
+            self._parse_received_bytes_until_stdout_closes()
+        finally:
+            if self._wakeup_write is not None:
+                # Tells the GUI that the thread is done
+                os.close(self._wakeup_write)
+
+    def _parse_received_bytes_until_stdout_closes(self) -> None:
+        while True:
+            received_bytes = self._received_queue.get()
+            if not received_bytes:
+                # langserver's stdout was closed
+                break
+
+            try:
+                for message in self._message_splitter.feed(received_bytes):
+                    with self._lsp_client_lock:
+                        for lsp_event in self._lsp_client.recv(message):
+                            self._event_queue.put(lsp_event)
+            except Exception as e:
+                # A hack elsewhere in this file causes an event that sansio-lsp-client
+                # doesn't understand. To find it, ctrl+f hack.
+                if isinstance(e, NotImplementedError) and (
+                    "workspace/didChangeConfiguration" in str(e)
+                ):
+                    self.log.debug(f"got NotImplementedError from hacky code as expected: {e}")
+                else:
+                    self.log.exception("error while parsing data from langserver")
+
+            self._event_queue.put(None)
+            if self._wakeup_write is not None:
+                try:
+                    os.write(self._wakeup_write, b"x")
+                except OSError:
+                    # Pipe is full, so the GUI will wake up anyway
+                    pass
+
+    def _handle_parsed_events(self) -> None:
+        handled_something = False
+        while True:
+            try:
+                lsp_event = self._event_queue.get(block=False)
+            except queue.Empty:
+                break
+
+            if lsp_event is None:
+                self._chunks_being_parsed -= 1
+                continue
+
+            handled_something = True
+            try:
+                self._handle_lsp_event(lsp_event)
+            except Exception:
+                self.log.exception("error while handling langserver event")
+
+        # Handling events can queue more messages, e.g. did_open after Initialized.
+        # Receiving can also queue messages, e.g. the initialized notification.
+        if handled_something:
+            self._send_queued_messages()
+
+        # Windows has no file handlers, so come back soon if the thread is still parsing
+        if (
+            sys.platform == "win32"
+            and self._chunks_being_parsed > 0
+            and not self._parsed_events_check_pending
+        ):
+            self._parsed_events_check_pending = True
+            get_tab_manager().after(10, self._check_parsed_events_again)
+
+    def _check_parsed_events_again(self) -> None:
+        self._parsed_events_check_pending = False
+        self._handle_parsed_events()
+
+    def _on_wakeup_pipe_readable(self, fileno: int, mask: int) -> None:
+        try:
+            if not os.read(fileno, 1024):
+                # The thread is done and closed its end
+                if sys.platform != "win32":
+                    get_tab_manager().tk.deletefilehandler(fileno)
+                os.close(fileno)
+                self._wakeup_read = None
+        except BlockingIOError:
+            pass
+        self._handle_parsed_events()
+
+    def _on_stdout_readable(self, fileno: int, mask: int) -> None:
+        self._run_stuff_once()
+
     # returns whether this should be ran again
     def _run_stuff_once(self) -> bool:
-        self._io.write(self._lsp_client.send())
+        if self._stdout_closed:
+            return False
+
         received_bytes = self._io.read()
 
         # yes, None and b'' have a different meaning here
@@ -348,44 +629,38 @@ class LangServer:
             # the process are useless.
             #
             # TODO: try to restart the langserver process?
+            self._stdout_closed = True
+            self._received_queue.put(b"")  # stop the parsing thread
+            if sys.platform != "win32":
+                get_tab_manager().tk.deletefilehandler(self._io.fileno())
             self._ensure_langserver_process_quits_soon()
             return False
 
         assert received_bytes
         self.log.debug(f"got {len(received_bytes)} bytes of data")
 
-        try:
-            for lsp_event in self._lsp_client.recv(received_bytes):
-                self._handle_lsp_event(lsp_event)
-        except Exception as e:
-            # A hack elsewhere in this file causes an event that sansio-lsp-client
-            # doesn't understand. To find it, ctrl+f hack.
-            if isinstance(e, NotImplementedError) and "workspace/didChangeConfiguration" in str(e):
-                self.log.debug(f"got NotImplementedError from hacky code as expected: {e}")
-            else:
-                self.log.exception("error while handling langserver event")
-
+        self._received_queue.put(received_bytes)
+        self._chunks_being_parsed += 1
+        if sys.platform == "win32":
+            self._handle_parsed_events()
         return True
 
     def _send_tab_opened_message(self, tab: tabs.FileTab) -> None:
         config = tab.settings.get("langserver", Optional[LangServerConfig])
-        assert tab.path is not None
-
-        self._lsp_client.did_open(
-            lsp.TextDocumentItem(
-                uri=tab.path.as_uri(),
-                languageId=config.language_id,
-                text=tab.textwidget.get("1.0", "end - 1 char"),
-                version=next(self._version_counter),
-            )
+        item = lsp.TextDocumentItem(
+            uri=self.tabs_opened[tab],
+            languageId=config.language_id,
+            text=tab.textwidget.get("1.0", "end - 1 char"),
+            version=next(self._version_counter),
         )
+        self._call_client(partial(self._lsp_client.did_open, item))
 
     def _handle_lsp_event(self, lsp_event: lsp.Event) -> None:
         self.log.debug(f"handling event: {lsp_event}")
 
         if isinstance(lsp_event, lsp.Shutdown):
             self.log.debug("langserver sent Shutdown event")
-            self._lsp_client.exit()
+            self._call_client(self._lsp_client.exit)
             self._get_removed_from_langservers()
             return
 
@@ -412,6 +687,7 @@ class LangServer:
                 "langserver initialized, capabilities:\n" + pprint.pformat(lsp_event.capabilities)
             )
 
+            self._initialized = True
             for tab in self.tabs_opened:
                 self._send_tab_opened_message(tab)
 
@@ -419,13 +695,15 @@ class LangServer:
             #   - This causes an error because sansio-lsp-client doesn't
             #     officially support workspace/didChangeConfiguration yet.
             #   - This doesn't refresh as venv changes.
-            self._lsp_client._send_request(
-                "workspace/didChangeConfiguration",
-                {
-                    "settings": _substitute_python_venv_recursively(
-                        self._config.settings, python_venv.get_venv(self._project_root)
-                    )
-                },
+            settings = _substitute_python_venv_recursively(
+                self._config.settings, python_venv.get_venv(self._project_root)
+            )
+            self._call_client(
+                partial(
+                    self._lsp_client._send_request,
+                    "workspace/didChangeConfiguration",
+                    {"settings": settings},
+                )
             )
             return
 
@@ -440,9 +718,8 @@ class LangServer:
             # TODO: use textEdit when available (need to find langserver that
             #       gives completions with textEdit for that to work)
             before_cursor = tab.textwidget.get(f"{req.cursor_pos} linestart", req.cursor_pos)
-            match = re.fullmatch(r".*?(\w*)", before_cursor)
-            assert match is not None
-            prefix_len = len(match.group(1))
+            prefix_len = _count_trailing_word_chars(before_cursor)
+            replace_start = tab.textwidget.index(f"{req.cursor_pos} - {prefix_len} chars")
 
             assert lsp_event.completion_list is not None
             tab.event_generate(
@@ -452,9 +729,7 @@ class LangServer:
                     completions=[
                         autocomplete.Completion(
                             display_text=item.label,
-                            replace_start=tab.textwidget.index(
-                                f"{req.cursor_pos} - {prefix_len} chars"
-                            ),
+                            replace_start=replace_start,
                             replace_end=req.cursor_pos,
                             replace_text=item.insertText or item.label,
                             # TODO: is slicing necessary here?
@@ -473,11 +748,7 @@ class LangServer:
             return
 
         if isinstance(lsp_event, lsp.PublishDiagnostics):
-            matching_tabs = [
-                tab
-                for tab in self.tabs_opened
-                if tab.path is not None and tab.path.as_uri() == lsp_event.uri
-            ]
+            matching_tabs = [tab for tab, uri in self.tabs_opened.items() if uri == lsp_event.uri]
             if not matching_tabs:
                 # Some langservers send diagnostics to closed tabs
                 self.log.debug(f"PublishDiagnostics sent to closed tab: {lsp_event}")
@@ -550,14 +821,17 @@ class LangServer:
         raise NotImplementedError(repr(lsp_event))
 
     def run_stuff(self) -> None:
-        if self._run_stuff_once():
+        # Windows has no file handlers, so this is how we notice new data.
+        # Elsewhere the file handler calls _run_stuff_once() when needed.
+        if self._run_stuff_once() and sys.platform == "win32":
             get_tab_manager().after(50, self.run_stuff)
 
     def open_tab(self, tab: tabs.FileTab) -> None:
         assert tab not in self.tabs_opened
-        self.tabs_opened.add(tab)
+        assert tab.path is not None
+        self.tabs_opened[tab] = tab.path.as_uri()
         self.log.debug("tab opened")
-        if self._lsp_client.state == lsp.ClientState.NORMAL:
+        if self._is_ready():
             self._send_tab_opened_message(tab)
 
     def forget_tab(self, tab: tabs.FileTab, *, may_shutdown: bool = True) -> None:
@@ -567,7 +841,8 @@ class LangServer:
             )
             return
 
-        self.tabs_opened.remove(tab)
+        del self.tabs_opened[tab]
+        self._pending_changes.pop(tab, None)
         self.log.debug("tab closed")
 
         if may_shutdown and not self.tabs_opened:
@@ -576,59 +851,71 @@ class LangServer:
             self._get_removed_from_langservers()
 
             if self._lsp_client.state == lsp.ClientState.NORMAL:
-                self._lsp_client.shutdown()
+                self._call_client(self._lsp_client.shutdown)
             else:
                 # it was never fully started
                 self._process.kill()
 
     def request_completions(self, tab: tabs.FileTab, event: utils.EventWithData) -> None:
-        if self._lsp_client.state != lsp.ClientState.NORMAL:
+        if not self._is_ready():
             self.log.warning(
                 f"autocompletions requested but langserver state == {self._lsp_client.state!r}"
             )
             return
 
-        assert tab.path is not None
         request = event.data_class(autocomplete.Request)
-        lsp_id = self._lsp_client.completion(
-            text_document_position=lsp.TextDocumentPosition(
-                textDocument=lsp.TextDocumentIdentifier(uri=tab.path.as_uri()),
-                position=_position_tk2lsp(request.cursor_pos),
-            ),
-            context=lsp.CompletionContext(
-                # FIXME: this isn't always the case, porcupine can also trigger
-                #        it automagically
-                triggerKind=lsp.CompletionTriggerKind.INVOKED
-            ),
+        position = lsp.TextDocumentPosition(
+            textDocument=lsp.TextDocumentIdentifier(uri=self.tabs_opened[tab]),
+            position=_position_tk2lsp(request.cursor_pos),
         )
 
-        assert lsp_id not in self._autocompletion_requests
-        self._autocompletion_requests[lsp_id] = (tab, request)
+        def send_request() -> None:
+            lsp_id = self._lsp_client.completion(
+                text_document_position=position,
+                context=lsp.CompletionContext(
+                    # FIXME: this isn't always the case, porcupine can also trigger
+                    #        it automagically
+                    triggerKind=lsp.CompletionTriggerKind.INVOKED
+                ),
+            )
+            assert lsp_id not in self._autocompletion_requests
+            self._autocompletion_requests[lsp_id] = (tab, request)
+
+        self._queue_pending_changes()
+        self._call_client(send_request)
 
     def request_jump_to_definition(self, tab: tabs.FileTab) -> None:
         self.log.info(f"Jump to definition requested: {tab.path} {self._lsp_client.state}")
-        if tab.path is not None and self._lsp_client.state == lsp.ClientState.NORMAL:
-            request_id = self._lsp_client.definition(
-                lsp.TextDocumentPosition(
-                    textDocument=lsp.TextDocumentIdentifier(uri=tab.path.as_uri()),
-                    position=_position_tk2lsp(tab.textwidget.index("insert")),
-                )
+        if tab.path is not None and self._is_ready():
+            position = lsp.TextDocumentPosition(
+                textDocument=lsp.TextDocumentIdentifier(uri=self.tabs_opened[tab]),
+                position=_position_tk2lsp(tab.textwidget.index("insert")),
             )
-            self._jump2def_requests[request_id] = tab
+
+            def send_request() -> None:
+                request_id = self._lsp_client.definition(position)
+                self._jump2def_requests[request_id] = tab
+
+            self._queue_pending_changes()
+            self._call_client(send_request)
 
     def request_hover(self, tab: tabs.FileTab, location: str) -> None:
         self.log.info(f"Hover requested: {tab.path} {self._lsp_client.state}")
-        if tab.path is not None and self._lsp_client.state == lsp.ClientState.NORMAL:
-            request_id = self._lsp_client.hover(
-                lsp.TextDocumentPosition(
-                    textDocument=lsp.TextDocumentIdentifier(uri=tab.path.as_uri()),
-                    position=_position_tk2lsp(location),
-                )
+        if tab.path is not None and self._is_ready():
+            position = lsp.TextDocumentPosition(
+                textDocument=lsp.TextDocumentIdentifier(uri=self.tabs_opened[tab]),
+                position=_position_tk2lsp(location),
             )
-            self._hover_requests[request_id] = (tab, location)
+
+            def send_request() -> None:
+                request_id = self._lsp_client.hover(position)
+                self._hover_requests[request_id] = (tab, location)
+
+            self._queue_pending_changes()
+            self._call_client(send_request)
 
     def send_change_events(self, tab: tabs.FileTab, changes: textutils.Changes) -> None:
-        if self._lsp_client.state != lsp.ClientState.NORMAL:
+        if not self._is_ready():
             # The langserver will receive the actual content of the file once
             # it starts.
             self.log.debug(
@@ -636,21 +923,38 @@ class LangServer:
             )
             return
 
-        assert tab.path is not None
-        self._lsp_client.did_change(
-            text_document=lsp.VersionedTextDocumentIdentifier(
-                uri=tab.path.as_uri(), version=next(self._version_counter)
-            ),
-            content_changes=[
-                lsp.TextDocumentContentChangeEvent(
-                    range=lsp.Range(
-                        start=_position_tk2lsp(change.start), end=_position_tk2lsp(change.old_end)
+        if not self._pending_changes:
+            get_tab_manager().after_idle(self._send_pending_changes)
+
+        # See _position_tk2lsp() for why construct()
+        self._pending_changes.setdefault(tab, []).extend(
+            lsp.TextDocumentContentChangeEvent.construct(
+                range=lsp.Range.construct(
+                    start=_position_tk2lsp(change.start), end=_position_tk2lsp(change.old_end)
+                ),
+                text=change.new_text,
+            )
+            for change in changes.change_list
+        )
+
+    # Requests must see the latest content, so this is called before requesting anything
+    def _queue_pending_changes(self) -> None:
+        for tab, content_changes in self._pending_changes.items():
+            self._client_calls.append(
+                partial(
+                    self._lsp_client.did_change,
+                    text_document=lsp.VersionedTextDocumentIdentifier(
+                        uri=self.tabs_opened[tab], version=next(self._version_counter)
                     ),
-                    text=change.new_text,
+                    content_changes=content_changes,
                 )
-                for change in changes.change_list
-            ],
-        )
+            )
+        self._pending_changes.clear()
+
+    def _send_pending_changes(self) -> None:
+        if self._is_ready():
+            self._queue_pending_changes()
+            self._send_queued_messages()
 
 
 # String in key is the command. Each project can have multiple langservers with
@@ -1,15 +1,21 @@
 """Run commands within the Porcupine window."""
 from __future__ import annotations
 
+import codecs
+import errno
+import itertools
 import locale
 import logging
 import os
 import queue
 import re
+import shlex
+import shutil
 import signal
 import subprocess
 import sys
 import threading
+import time
 import tkinter
 from functools import partial
 from pathlib import Path
@@ -39,14 +45,17 @@ filename_regex_parts = [
     # c compiler output, also many other tools
     # TODO: support spaces in file names?
     # playground.c:4:9: warning: ...
-    r"([^\n\s:()]+):([0-9]+)",
+    # The lookbehind makes this fast for long lines, by not trying every position in a word
+    r"(?<![^\n\s:()])([^\n\s:()]+):([0-9]+)",
     # python error
     r'File "([^\n"]+)", line ([0-9]+)',
     # valgrind, SDL_assert() etc
     # blah blah: some_function (filename.c:123)
     r"\(([^\n():]+):([0-9]+)\)",
 ]
-filename_regex = "(?i)" + "|".join(r"(?:" + part + r")" for part in filename_regex_parts)
+filename_regex = re.compile(
+    "|".join(r"(?:" + part + r")" for part in filename_regex_parts), flags=re.IGNORECASE
+)
 
 
 def open_file_with_line_number(path: Path, lineno: int) -> None:
@@ -59,122 +68,333 @@ def open_file_with_line_number(path: Path, lineno: int) -> None:
 
 
 MAX_SCROLLBACK = 5000
+SCROLLBACK_SLACK = 500
+
+# Windows only, see _put_queued_items_to_textwidget()
+MIN_POLL_INTERVAL_MS = 10
+MAX_POLL_INTERVAL_MS = 200
+
+# If the GUI can't keep up with a process that prints a lot, the thread waits
+# until there's less than this many characters of output waiting
+MAX_QUEUED_OUTPUT = 64 * 1024
 OUTPUT_TAGS = {"info": "Token.Keyword", "output": "Token.Text", "error": "Token.Name.Exception"}
+_INSERT_TAGS = {message_type: (tag, "uneditable") for message_type, tag in OUTPUT_TAGS.items()}
+
+# Messages are (type, text, links). A link is (start, end, match), where start
+# and end are relative to the text. A link that began in an earlier message
+# has a negative start.
+_Message = tuple[str, str, list[tuple[int, int, re.Match[str]]]]
+
+# Anything that the shell would handle differently than shlex.split()
+_SHELL_SYNTAX_REGEX = re.compile(r"[|&;<>()$`\\*?\[\]{}~#!\n]")
+# Shell builtins. Some systems (e.g. macOS) also have programs like /usr/bin/cd,
+# but running them doesn't do the same thing.
+_SHELL_BUILTINS = set(
+    """
+    . cd source exec eval exit export set unset alias umask ulimit read wait trap command type time
+    """.split()
+)
+
+
+# Starting a shell to run e.g. "python3 foo.py" is an extra fork and exec.
+def _split_simple_command(command: str, cwd: Path, env: dict[str, str]) -> list[str] | None:
+    if _SHELL_SYNTAX_REGEX.search(command):
+        return None
+
+    try:
+        args = shlex.split(command)
+    except ValueError:
+        # e.g. missing closing quote, let the shell show its error message
+        return None
+
+    # VAR=value is not a program
+    if not args or "=" in args[0] or args[0] in _SHELL_BUILTINS:
+        return None
+    if "/" in args[0]:
+        program = cwd / args[0]  # doesn't use cwd if absolute
+        try:
+            if not (program.is_file() and os.access(program, os.X_OK)):
+                return None
+        except OSError:
+            # e.g. filename too long
+            return None
+    elif shutil.which(args[0], path=env.get("PATH")) is None:
+        return None
+    return args
 
 
 class Executor:
     def __init__(self, cwd: Path, textwidget: tkinter.Text, link_manager: textutils.LinkManager):
         self.cwd = cwd
+        self.encoding = locale.getpreferredencoding(False)
         self._textwidget = textwidget
         self._link_manager = link_manager
+        # Updated on each insert, so that we don't need to delete on every insert
+        self._line_count = int(textwidget.index("end - 1 char").split(".")[0])
 
         self._shell_process: subprocess.Popen[bytes] | None = None
+        self._psutil_process: psutil.Process | None = None
         self._input_queue: queue.Queue[bytes] = queue.Queue(maxsize=1)
-        self._queue: queue.Queue[tuple[str, str]] = queue.Queue(maxsize=1)
+        # The thread appends here, and the GUI takes everything at once
+        self._queue: list[_Message] = []
+        self._line_without_links = ""  # only used in the thread
+        self._queued_output_length = 0
+        self._queue_condition = threading.Condition()
+        # When stopped and nothing will take from the queue, the thread must not wait for it
+        self._stopped = False
+        self._end_handled = False
         self._timeout_id: str | None = None
+        self._poll_interval_ms = MIN_POLL_INTERVAL_MS
+        # The thread writes to this pipe when it puts something to the queue
+        self._wakeup_read: int | None = None
+        self._wakeup_write: int | None = None
         self.started = False
         self.paused = False
         self._thread: threading.Thread | None = None
 
-    def run(self, command: str) -> None:
+    def run(self, command: str, *, char_width: int, line_height: int) -> None:
         env = common.prepare_env()
         env["PYTHONUNBUFFERED"] = "1"  # same as passing -u option to python (#802)
 
-        # Update needed to get width and height, but causes key bindings to execute
-        self._textwidget.update()
+        # Geometry is calculated in idle tasks, e.g. when the output was just un-hidden.
+        # Don't use update(), because it would also run key bindings.
+        self._textwidget.update_idletasks()
         width, height = textutils.textwidget_size(self._textwidget)
+        env["COLUMNS"] = str(width // char_width)
+        env["LINES"] = str(height // line_height)
 
-        font = tkinter.font.Font(name="TkFixedFont", exists=True)
-        env["COLUMNS"] = str(width // font.measure("a"))
-        env["LINES"] = str(height // font.metrics("linespace"))
+        if sys.platform != "win32":
+            # Handle output when there is some, instead of checking the queue periodically
+            self._wakeup_read, self._wakeup_write = os.pipe()
+            os.set_blocking(self._wakeup_read, False)
+            os.set_blocking(self._wakeup_write, False)
+            self._textwidget.tk.createfilehandler(
+                self._wakeup_read, tkinter.READABLE, self._on_wakeup_pipe_readable
+            )
 
         self._thread = threading.Thread(
             target=self._thread_target, args=[command, env], daemon=True
         )
         self._thread.start()
-        self._poll_queue_and_put_to_textwidget()
+        self._put_queued_items_to_textwidget()
         self.started = True
 
     @property
     def running(self) -> bool:
         return self._shell_process is not None and self._shell_process.poll() is None
 
+    def _find_links(self, text: str) -> list[tuple[int, int, re.Match[str]]]:
+        # Links can't span multiple lines, so search only lines that are complete
+        last_newline = text.rfind("\n")
+        if last_newline == -1:
+            self._line_without_links += text
+            return []
+
+        offset = len(self._line_without_links)
+        lines = self._line_without_links + text[:last_newline]
+        self._line_without_links = text[last_newline + 1 :]
+        return [
+            (match.start() - offset, match.end() - offset, match)
+            for match in filename_regex.finditer(lines)
+        ]
+
+    def _put_to_queue(self, message_type: str, text: str) -> None:
+        # Searching links is done here, so that the GUI doesn't freeze with a lot of output
+        links = self._find_links(text)
+        with self._queue_condition:
+            self._queue_condition.wait_for(
+                lambda: self._stopped or self._queued_output_length < MAX_QUEUED_OUTPUT
+            )
+            if self._stopped:
+                return
+            was_empty = not self._queue
+            self._queue.append((message_type, text, links))
+            self._queued_output_length += len(text)
+            self._queue_condition.notify_all()
+
+        # If the queue wasn't empty, the GUI hasn't yet taken what's already there
+        if was_empty and self._wakeup_write is not None:
+            try:
+                os.write(self._wakeup_write, b"x")
+            except OSError:
+                # GUI stopped listening, or pipe is full (lots of wakeups pending anyway)
+                pass
+
     def _thread_target(self, command: str, env: dict[str, str]) -> None:
-        self._queue.put(("info", command + "\n"))
+        try:
+            self._run_process(command, env)
+        finally:
+            if self._wakeup_write is not None:
+                # Tells the GUI that there won't be more output
+                os.close(self._wakeup_write)
+
+    def _start_process(
+        self, command: str, args: list[str] | None, env: dict[str, str]
+    ) -> subprocess.Popen[bytes]:
+        return subprocess.Popen(
+            command if args is None else args,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            shell=(args is None),
+            env=env,
+            # Puts the shell and everything it runs into a new process group (not on windows)
+            start_new_session=True,
+            **utils.subprocess_kwargs,
+        )
 
+    def _run_process(self, command: str, env: dict[str, str]) -> None:
+        self._put_to_queue("info", command + "\n")
+
+        if sys.platform == "win32":
+            # Windows commands don't use shell quoting
+            args: list[str] | None = None
+        else:
+            args = _split_simple_command(command, self.cwd, env)
         try:
-            self._shell_process = subprocess.Popen(
-                command,
-                cwd=self.cwd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                shell=True,
-                env=env,
-                **utils.subprocess_kwargs,
-            )
+            try:
+                self._shell_process = self._start_process(command, args, env)
+            except OSError as e:
+                if args is None or e.errno != errno.ENOEXEC:
+                    raise
+                # Executable file without a shebang, shells run those as shell scripts
+                self._shell_process = self._start_process(command, None, env)
         except OSError as e:
-            self._queue.put(("error", f"{type(e).__name__}: {e}\n"))
+            self._put_to_queue("error", f"{type(e).__name__}: {e}\n")
             log.debug("here's full traceback", exc_info=True)
             return
 
+        # Incremental decoder handles characters that get split between two reads
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+
+        # Reading the file descriptor directly skips the BufferedReader of stdout.
+        # It returns as soon as there is something to read, like read1() did.
         assert self._shell_process.stdout is not None
+        stdout_fileno = self._shell_process.stdout.fileno()
+        held_back = ""
         while True:
-            bytez = self._shell_process.stdout.read1()  # type: ignore
+            bytez = os.read(stdout_fileno, 64 * 1024)
+            text = held_back + decoder.decode(bytez, final=(not bytez))
+            if bytez and text.endswith("\r"):
+                # Next read might start with "\n"
+                text, held_back = text[:-1], "\r"
+            else:
+                held_back = ""
+            if text:
+                self._put_to_queue("output", utils.tkinter_safe_string(text).replace("\r\n", "\n"))
             if not bytez:
                 break
-            text = bytez.decode(locale.getpreferredencoding(), errors="replace")
-            self._queue.put(("output", utils.tkinter_safe_string(text).replace("\r\n", "\n")))
 
         status = self._shell_process.wait()
         if status == 0:
-            self._queue.put(("info", "The process completed successfully."))
-        else:
-            self._queue.put(("error", f"The process failed with status {status}."))
-        self._queue.put(("end", ""))
-
-    def _handle_queued_item(self, message_type: str, text: str) -> None:
-        if message_type == "end":
-            assert not text
-            get_tab_manager().event_generate("<<FileSystemChanged>>")
+            self._put_to_queue("info", "The process completed successfully.")
         else:
-            scrolled_to_end = self._textwidget.yview()[1] == 1.0
-
-            self._textwidget.insert("end", text, [OUTPUT_TAGS[message_type], "uneditable"])
-            # Add links to full lines
-            linked_line_count = text.count("\n")
-            self._link_manager.add_links(
-                start=f"end - 1 char linestart - {linked_line_count} lines",
-                end="end - 1 char linestart",
+            self._put_to_queue("error", f"The process failed with status {status}.")
+        self._put_to_queue("end", "")
+
+    # Changing the text widget is slow, so consecutive items of the same type
+    # are inserted at once, and old output is deleted only once.
+    def _handle_queued_items(self, items: list[_Message]) -> None:
+        scrolled_to_end = self._textwidget.yview()[1] == 1.0
+        new_line_count = 0
+
+        for message_type, group in itertools.groupby(items, key=(lambda item: item[0])):
+            if message_type == "end":
+                self._end_handled = True
+                get_tab_manager().event_generate("<<FileSystemChanged>>")
+                continue
+
+            messages = list(group)
+            text = "".join(text for junk, text, links in messages)
+            start = self._textwidget.index("end - 1 char")
+            self._textwidget.insert("end", text, _INSERT_TAGS[message_type])
+            new_line_count += text.count("\n")
+
+            offset = 0
+            for junk, message_text, links in messages:
+                for link_start, link_end, match in links:
+                    self._link_manager.add_link(
+                        # Sign is needed, because link_start can be negative
+                        f"{start} {offset + link_start:+d} chars",
+                        f"{start} {offset + link_end:+d} chars",
+                        match,
+                    )
+                offset += len(message_text)
+
+        if scrolled_to_end:
+            self._textwidget.yview_moveto(1)
+
+        self._line_count += new_line_count
+        if self._line_count > MAX_SCROLLBACK:
+            # Delete a bit more than needed, so that we don't do this again for a while
+            self._textwidget.delete("1.0", f"end - {MAX_SCROLLBACK - SCROLLBACK_SLACK} lines")
+            self._line_count = int(self._textwidget.index("end - 1 char").split(".")[0])
+
+    def _on_wakeup_pipe_readable(self, fileno: int, mask: int) -> None:
+        try:
+            if not os.read(fileno, 1024):
+                # The thread is done and closed its end
+                self._stop_listening_to_wakeup_pipe()
+        except BlockingIOError:
+            pass
+        self._put_queued_items_to_textwidget()
+
+    def _stop_listening_to_wakeup_pipe(self) -> None:
+        if sys.platform != "win32" and self._wakeup_read is not None:
+            self._textwidget.tk.deletefilehandler(self._wakeup_read)
+            os.close(self._wakeup_read)
+            self._wakeup_read = None
+
+    def _take_queued_items(self, *, timeout: float = 0) -> list[_Message]:
+        with self._queue_condition:
+            if timeout > 0:
+                self._queue_condition.wait_for(lambda: self._queue, timeout)
+            items = self._queue
+            self._queue = []
+            self._queued_output_length = 0
+            self._queue_condition.notify_all()
+        return items
+
+    def _put_queued_items_to_textwidget(self) -> None:
+        items = self._take_queued_items()
+        if items:
+            self._handle_queued_items(items)
+
+        if sys.platform == "win32":
+            # Windows has no file handlers, so the queue must be checked periodically.
+            # Poll often while output is coming, and less often when nothing happens.
+            if items:
+                self._poll_interval_ms = MIN_POLL_INTERVAL_MS
+            else:
+                self._poll_interval_ms = min(2 * self._poll_interval_ms, MAX_POLL_INTERVAL_MS)
+            self._timeout_id = self._textwidget.after(
+                self._poll_interval_ms, self._put_queued_items_to_textwidget
             )
-            if scrolled_to_end:
-                self._textwidget.yview_moveto(1)
-
-        self._textwidget.delete("1.0", f"end - {MAX_SCROLLBACK} lines")
-
-    def _poll_queue_and_put_to_textwidget(self) -> None:
-        # too many iterations here freezes the GUI when an infinite loop with print is running
-        for iteration in range(10):
-            try:
-                message_type, text = self._queue.get(block=False)
-            except queue.Empty:
-                break
-            self._handle_queued_item(message_type, text)
 
-        self._timeout_id = self._textwidget.after(50, self._poll_queue_and_put_to_textwidget)
+    def _get_psutil_process(self) -> psutil.Process:
+        # Reusing the same object also lets psutil notice if the pid gets reused
+        assert self._shell_process is not None
+        if self._psutil_process is None:
+            self._psutil_process = psutil.Process(self._shell_process.pid)
+        return self._psutil_process
 
     def send_signal(self, signal: signal.Signals) -> None:
         if self._shell_process is None:
             return
 
         try:
-            process = psutil.Process(self._shell_process.pid)
-            process.send_signal(signal)
-            for child in process.children():
-                try:
-                    child.send_signal(signal)
-                except psutil.NoSuchProcess:
-                    pass
+            if sys.platform == "win32":
+                process = self._get_psutil_process()
+                process.send_signal(signal)
+                for child in process.children():
+                    try:
+                        child.send_signal(signal)
+                    except psutil.NoSuchProcess:
+                        pass
+            else:
+                # The shell is the leader of its process group
+                os.killpg(self._shell_process.pid, signal)
 
         except (psutil.NoSuchProcess, ProcessLookupError):
             pass
@@ -183,58 +403,90 @@ class Executor:
         if self._timeout_id is not None:
             self._textwidget.after_cancel(self._timeout_id)
             self._timeout_id = None
+        self._stop_listening_to_wakeup_pipe()
 
         if self._shell_process is None:
             return
 
+        killed = False
         try:
-            # On non-windows we can stop the shell so that it can't spawn more children
-            # On windows there is a race condition
-            if sys.platform != "win32":
-                self._shell_process.send_signal(signal.SIGSTOP)
-
-            # If we kill the shell, its child processes will keep running.
-            # But they will reparent to pid 1 so can no longer list them
-            children = psutil.Process(self._shell_process.pid).children()
-            if self._shell_process.poll() is None:
-                # shell still alive, the pid wasn't reused
-                self._shell_process.kill()
-                for child in children:
-                    try:
-                        child.kill()
-                    except psutil.NoSuchProcess:
-                        # Child already dead, but we need to kill other children
-                        pass
+            if sys.platform == "win32":
+                # If we kill the shell, its child processes will keep running.
+                # But they will reparent to pid 1 so can no longer list them.
+                # There is a race condition: the shell can spawn more children.
+                children = self._get_psutil_process().children()
+                if self._shell_process.poll() is None:
+                    # shell still alive, the pid wasn't reused
+                    self._shell_process.kill()
+                    killed = True
+                    for child in children:
+                        try:
+                            child.kill()
+                        except psutil.NoSuchProcess:
+                            # Child already dead, but we need to kill other children
+                            pass
+
+            elif self._shell_process.poll() is None:
+                # Shell still alive, so its pid is not reused yet. This kills the
+                # shell and everything it started at once, so nothing can escape.
+                os.killpg(self._shell_process.pid, signal.SIGKILL)
+                killed = True
 
         # shell can die at any time
         # non-psutil errors happen in langserver plugin, not sure if needed here
         except (psutil.NoSuchProcess, ProcessLookupError):
             pass
 
-        else:
-            if not quitting:
-                assert self._thread is not None
-                assert self._thread.is_alive()
+        assert self._thread is not None
+        if quitting:
+            with self._queue_condition:
+                self._stopped = True
+                self._queue_condition.notify_all()
+
+        elif not self._end_handled:
+            output_ends_soon = killed
+            if sys.platform != "win32" and not killed and self._thread.is_alive():
+                # The process finished, but the thread is still reading its output.
+                # If a background process has the output pipe open, it would never stop.
+                try:
+                    os.killpg(self._shell_process.pid, signal.SIGKILL)
+                    output_ends_soon = True
+                except ProcessLookupError:
+                    pass
 
+            # Consume queue until the thread stops. Something that wasn't killed
+            # (e.g. a daemon) can keep the output pipe open, so don't wait forever.
+            deadline = time.monotonic() + (1 if output_ends_soon else 0)
+            items: list[_Message] = []
+            while not items or items[-1][0] != "end":
+                new_items = self._take_queued_items(timeout=deadline - time.monotonic())
+                if not new_items:
+                    break
+                items += new_items
+
+            if items and items[-1][0] == "end":
+                self._thread.join()
+            else:
+                # Output that comes later is ignored, and the thread must not wait for it
+                with self._queue_condition:
+                    self._stopped = True
+                    self._queue_condition.notify_all()
+
+            if killed:
                 if sys.platform == "win32":
                     kill_status = 1
                 else:
                     kill_status = -signal.SIGKILL
 
-                # Consume queue until the thread stops
-                while True:
-                    message_type, text = self._queue.get(block=True)
-                    # For killing messages, a separate "Killed." will be added below
-                    if (message_type, text) != (
-                        "error",
-                        f"The process failed with status {kill_status}.",
-                    ):
-                        self._handle_queued_item(message_type, text)
-                    if message_type == "end":
-                        break
-                self._thread.join()
-
-                self._handle_queued_item("error", "Killed.")
+                # For killing messages, a separate "Killed." is added instead
+                kill_message: _Message = (
+                    "error",
+                    f"The process failed with status {kill_status}.",
+                    [],
+                )
+                items = [item for item in items if item != kill_message]
+                items.append(("error", "Killed.", []))
+            self._handle_queued_items(items)
 
         if not quitting:
             get_tab_manager().event_generate("<<FileSystemChanged>>")
@@ -243,7 +495,10 @@ class Executor:
         if self._shell_process is not None:
             assert self._shell_process.stdin is not None
             self._shell_process.stdin.write(data)
-            self._shell_process.stdin.flush()  # TODO: may block, maybe that isn't an issue in practice?
+            # Send full lines, like a terminal would. Closing stdin flushes the rest.
+            # TODO: flushing may block, maybe that isn't an issue in practice?
+            if data.endswith(b"\n"):
+                self._shell_process.stdin.flush()
 
     def close_stdin(self) -> None:
         if self._shell_process is not None:
@@ -311,6 +566,13 @@ class NoTerminalRunner:
         )
         on_style_changed()
 
+        # Measuring the font is slow, so it's done only when the font changes
+        self.textwidget.bind(
+            "<<GlobalSettingChanged:font_family>>", self._update_font_size, add=True
+        )
+        self.textwidget.bind("<<GlobalSettingChanged:font_size>>", self._update_font_size, add=True)
+        self._update_font_size()
+
         self.textwidget.bind("<Destroy>", partial(self.stop_executor, quitting=True), add=True)
         self.textwidget.bind("<Control-D>", self._handle_end_of_input, add=True)
         self.textwidget.bind("<Control-d>", self._handle_end_of_input, add=True)
@@ -345,6 +607,11 @@ class NoTerminalRunner:
         self.hide_button.pack(side="left", padx=1)
         utils.set_tooltip(self.hide_button, "Hide output")
 
+    def _update_font_size(self, junk: object = None) -> None:
+        font = tkinter.font.Font(name="TkFixedFont", exists=True)
+        self.char_width = font.measure("a")
+        self.line_height = font.metrics("linespace")
+
     def _editing_should_be_blocked(self) -> bool:
         return (not self.textwidget.in_a_python_method) and (
             # Block editing when nothing is running
@@ -362,18 +629,23 @@ class NoTerminalRunner:
             self.textwidget.insert("end - 1 char", "\n")
             self.textwidget.see("insert")
 
-            input_line = self.textwidget.get("uneditable.last", "end - 1 char").replace(
-                "\n", os.linesep
-            )
+            input_line = self.textwidget.get("uneditable.last", "end - 1 char")
+            if sys.platform == "win32":
+                input_line = input_line.replace("\n", "\r\n")
             self.textwidget.tag_add("uneditable", "1.0", "end - 1 char")
             self.executor.write_to_stdin(
-                input_line.encode(locale.getpreferredencoding(), errors="replace")
+                input_line.encode(self.executor.encoding, errors="replace")
             )
 
         return "break"
 
     def _handle_backspace(self, event: tkinter.Event[tkinter.Text]) -> str:
-        if "uneditable" not in self.textwidget.tag_names("insert - 1 char"):
+        # Checking the tags last avoids asking Tk when nothing is running
+        if (
+            self.executor is not None
+            and self.executor.running
+            and "uneditable" not in self.textwidget.tag_names("insert - 1 char")
+        ):
             self.textwidget.delete("insert - 1 char", "insert")
         return "break"
 
@@ -433,7 +705,7 @@ class NoTerminalRunner:
         self.pause_button.configure(image=images.get("pause"))
 
         self.executor = Executor(cwd, self.textwidget, self._link_manager)
-        self.executor.run(command)
+        self.executor.run(command, char_width=self.char_width, line_height=self.line_height)
 
 
 runner: NoTerminalRunner | None = None
@@ -478,8 +750,7 @@ def set_output_height() -> None:
     assert runner is not None
     current_height = textutils.textwidget_size(runner.textwidget)[1]
     padding = textutils.get_padding(runner.textwidget)[1]
-    linespace = tkinter.font.Font(font="TkFixedFont").metrics("linespace")
-    minimum_height = 3 * linespace + 2 * padding
+    minimum_height = 3 * runner.line_height + 2 * padding
 
     if current_height < minimum_height:
         # No idea why, but setting the height once doesn't always work on Akuli's system.
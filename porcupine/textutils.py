@@ -576,10 +576,12 @@ class LinkManager:
     def __init__(
         self,
         textwidget: tkinter.Text,
-        link_regex: str,
+        link_regex: str | re.Pattern[str],
         get_click_callback: Callable[[re.Match[str]], Callable[[], object] | None],
     ) -> None:
         self._textwidget = textwidget
+        if isinstance(link_regex, str):
+            link_regex = re.compile(link_regex, flags=re.MULTILINE)
         self._link_regex = link_regex
         self._get_click_callback = get_click_callback
 
@@ -603,18 +605,21 @@ class LinkManager:
     # If you add text in parts, make sure that each link is within one part
     def add_links(self, start: str, end: str) -> None:
         text = self._textwidget.get(start, end)
-        for match in re.finditer(self._link_regex, text, flags=re.MULTILINE):
-            callback = self._get_click_callback(match)
-            if callback is None:
-                continue
-
-            link_specific_tag = f"link-{len(self._callbacks)}"
-            self._callbacks[link_specific_tag] = callback
-
-            tag_start = f"{start} + {match.start()} chars"
-            tag_end = f"{start} + {match.end()} chars"
-            self._textwidget.tag_add("link", tag_start, tag_end)
-            self._textwidget.tag_add(link_specific_tag, tag_start, tag_end)
+        for match in self._link_regex.finditer(text):
+            self.add_link(
+                f"{start} + {match.start()} chars", f"{start} + {match.end()} chars", match
+            )
+
+    # For when the link regex has already been used to find the match
+    def add_link(self, start: str, end: str, match: re.Match[str]) -> None:
+        callback = self._get_click_callback(match)
+        if callback is None:
+            return
+
+        link_specific_tag = f"link-{len(self._callbacks)}"
+        self._callbacks[link_specific_tag] = callback
+        self._textwidget.tag_add("link", start, end)
+        self._textwidget.tag_add(link_specific_tag, start, end)
 
     def delete_all_links(self) -> None:
         for tag in self._callbacks.keys():
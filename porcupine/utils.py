@@ -22,6 +22,7 @@ import dataclasses
 import functools
 import json
 import logging
+import os
 import re
 import shlex
 import shutil
@@ -30,7 +31,6 @@ import sys
 import threading
 import tkinter
 import traceback
-from collections.abc import Iterator
 from pathlib import Path
 from tkinter import ttk
 from typing import TYPE_CHECKING, Any, Callable, Literal, TypeVar, cast
@@ -39,6 +39,14 @@ import dacite
 
 import porcupine
 
+try:
+    # Optional, makes passing big dataclasses to events faster (e.g. lots of autocompletions)
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 log = logging.getLogger(__name__)
 _T = TypeVar("_T")
 
@@ -85,12 +93,20 @@ if sys.platform == "win32":
     )
 
 
-def _is_empty(iterator: Iterator[object]) -> bool:
+def _is_readme(filename: str) -> bool:
+    # Same as what path.glob("readme.*") etc would match. Globbing is
+    # case-insensitive on Windows.
+    if sys.platform == "win32":
+        return filename.lower().startswith("readme.")
+    else:
+        return filename.startswith(("readme.", "Readme.", "readMe.", "ReadMe.", "README."))
+
+
+def _list_directory(path: Path) -> list[str]:
     try:
-        next(iterator)
-        return False
-    except StopIteration:
-        return True
+        return os.listdir(path)
+    except OSError:
+        return []
 
 
 def find_project_root(project_file_path: Path) -> Path:
@@ -100,18 +116,19 @@ def find_project_root(project_file_path: Path) -> Path:
     """
     assert project_file_path.is_absolute()
 
-    likely_root = None
+    likely_root: Path | None = None
     for path in project_file_path.parents:
-        if (path / ".git").exists():
+        if likely_root is not None:
+            # Only .git matters anymore, no need to list the whole directory
+            if (path / ".git").exists():
+                return path
+            continue
+
+        # List the directory once, instead of checking each file separately
+        names = set(_list_directory(path))
+        if ".git" in names:
             return path  # trust this the most, if it exists
-        elif likely_root is None and (
-            (path / ".editorconfig").exists()
-            or not _is_empty(path.glob("readme.*"))
-            or not _is_empty(path.glob("Readme.*"))
-            or not _is_empty(path.glob("readMe.*"))
-            or not _is_empty(path.glob("ReadMe.*"))
-            or not _is_empty(path.glob("README.*"))
-        ):
+        if ".editorconfig" in names or any(map(_is_readme, names)):
             likely_root = path
 
     return likely_root or project_file_path.parent
@@ -353,6 +370,9 @@ def get_binding(virtual_event: str, *, menu: bool = False, many: bool = False) -
     return " or ".join(results)
 
 
+_UNSUPPORTED_CHARS_REGEX = re.compile("[\U00010000-\U0010FFFF]")
+
+
 # TODO: document this
 def tkinter_safe_string(string: str, *, hide_unsupported_chars: bool = False) -> str:
     if hide_unsupported_chars:
@@ -360,7 +380,10 @@ def tkinter_safe_string(string: str, *, hide_unsupported_chars: bool = False) ->
     else:
         replace_with = "\N{replacement character}"
 
-    return "".join(replace_with if ord(char) > 0xFFFF else char for char in string)
+    # Much faster than checking each character in Python, matters for big outputs
+    if string.isascii():
+        return string
+    return _UNSUPPORTED_CHARS_REGEX.sub(replace_with, string)
 
 
 class EventDataclass:
@@ -402,6 +425,17 @@ class EventDataclass:
     def __str__(self) -> str:
         # str(Foo(a=1, b=2)) --> 'Foo{"a": 1, "b": 2}'
         # Content after Foo is JSON parsed in Event.data_class()
+        if _HAS_ORJSON:
+            try:
+                result = orjson.dumps(self).decode("utf-8")
+            except TypeError:
+                # orjson doesn't like lone surrogate characters, json escapes them
+                pass
+            else:
+                # Unlike json.dumps(), orjson doesn't escape non-ASCII characters.
+                # Tcl doesn't always handle characters beyond U+FFFF correctly.
+                if not _UNSUPPORTED_CHARS_REGEX.search(result):
+                    return type(self).__name__ + result
         return type(self).__name__ + json.dumps(dataclasses.asdict(self))  # type: ignore
 
 
@@ -427,7 +461,16 @@ class EventWithData(_Event):
         ``T`` must be a dataclass that inherits from :class:`EventDataclass`.
         """
         assert self.data_string.startswith(T.__name__ + "{")
-        result = dacite.from_dict(T, json.loads(self.data_string[len(T.__name__) :]))
+        json_string = self.data_string[len(T.__name__) :]
+        if _HAS_ORJSON:
+            try:
+                json_dict = orjson.loads(json_string)
+            except orjson.JSONDecodeError:
+                # Lone surrogates escaped by json.dumps(), e.g. "\udc80"
+                json_dict = json.loads(json_string)
+        else:
+            json_dict = json.loads(json_string)
+        result = dacite.from_dict(T, json_dict)
         assert isinstance(result, T)
         return result
 
@@ -1,8 +1,13 @@
 # There's more langserver related tests in other files, e.g. test_jump_to_definition.py
+import re
 import sys
 from pathlib import Path
 
-from porcupine.plugins.langserver import _file_url_to_path
+from porcupine.plugins.langserver import (
+    _count_trailing_word_chars,
+    _file_url_to_path,
+    _MessageSplitter,
+)
 
 
 def test_file_url_to_path():
@@ -13,3 +18,34 @@ def test_file_url_to_path():
 
     for path in paths:
         assert _file_url_to_path(path.as_uri()) == path
+
+
+def test_message_splitter():
+    messages = [
+        b"Content-Length: 5\r\n\r\nhello",
+        b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\ncontent-length: 0\r\n\r\n",
+        b"Content-Length: 3\r\n\r\nabc",
+    ]
+    all_bytes = b"".join(messages)
+
+    for chunk_size in range(1, len(all_bytes) + 1):
+        splitter = _MessageSplitter()
+        result = []
+        for start in range(0, len(all_bytes), chunk_size):
+            result.extend(splitter.feed(all_bytes[start : start + chunk_size]))
+        assert result == messages
+
+
+def test_count_trailing_word_chars():
+    for string in [
+        "",
+        "foo",
+        "  foo.bar_baz",
+        "x = öö2",
+        "print(",
+        "foo bar ",
+        "a\N{pile of poo}b",
+    ]:
+        match = re.fullmatch(r".*?(\w*)", string)
+        assert match is not None
+        assert _count_trailing_word_chars(string) == len(match.group(1))
@@ -330,6 +330,63 @@ def test_crlf_on_any_platform(tmp_path, wait_until):
     wait_until(lambda: "foo\nbar" in get_output())
 
 
+def test_crlf_split_between_reads(tmp_path, wait_until):
+    (tmp_path / "crlf.py").write_text(
+        r"""
+import sys, time
+sys.stdout.buffer.write(b'foo\r')
+sys.stdout.flush()
+time.sleep(0.5)
+sys.stdout.buffer.write(b'\nbar')
+"""
+    )
+    no_terminal.run_command(f"{utils.quote(sys.executable)} crlf.py", tmp_path)
+    wait_until(lambda: "The process completed successfully." in get_output())
+    assert "\nfoo\nbar" in get_output()
+
+
+def test_link_split_between_reads(tabmanager, tmp_path, wait_until):
+    (tmp_path / "foo.py").write_text("first line\nsecond line\n")
+    (tmp_path / "split.py").write_text(
+        r"""
+import time
+print("error in foo.py", end="", flush=True)
+time.sleep(0.5)
+print(":2")
+"""
+    )
+    no_terminal.run_command(f"{utils.quote(sys.executable)} split.py", tmp_path)
+    wait_until(lambda: "The process completed successfully." in get_output())
+    assert "\nerror in foo.py:2\n" in get_output()
+    assert click_last_link() == "second line"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="commands are always ran with a shell")
+def test_split_simple_command(tmp_path):
+    env = dict(os.environ)
+    python = utils.quote(sys.executable)
+    split = lambda command: no_terminal._split_simple_command(command, tmp_path, env)
+
+    assert split(f"{python} 'foo bar.py' --x=y") == [sys.executable, "foo bar.py", "--x=y"]
+    assert split(f"{python} foo.py | grep x") is None
+    assert split(f"{python} *.py") is None
+    assert split(f"FOO=bar {python} foo.py") is None
+    assert split("cd ..") is None
+    assert split("umask 022") is None
+    assert split(f"exec {python} foo.py") is None
+    assert split("./doesnt_exist") is None
+    assert split(f"{python} 'unclosed") is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell script")
+def test_executable_without_shebang(tmp_path, wait_until):
+    (tmp_path / "script").write_text("echo hello $((1+2))\n")
+    (tmp_path / "script").chmod(0o755)
+    no_terminal.run_command("./script", tmp_path)
+    wait_until(lambda: "The process completed successfully." in get_output())
+    assert "hello 3\n" in get_output()
+
+
 def test_changing_current_file(filetab, tmp_path, wait_until):
     filetab.textwidget.insert("end", 'with open("foo.py", "w") as f: f.write("lol")')
     filetab.save_as(tmp_path / "foo.py")
@@ -472,6 +529,33 @@ def test_stop_button_pressed_after_finished(tmp_path, wait_until):
     assert "Killed" not in get_output()
 
 
+@pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX shell syntax")
+def test_stop_button_with_background_process(tmp_path, wait_until):
+    # The background process keeps the output pipe open after the shell exits
+    no_terminal.run_command("echo hello; sleep 10 &", tmp_path)
+    wait_until(lambda: not no_terminal.runner.executor.running)
+
+    start = time.monotonic()
+    no_terminal.runner.stop_button.event_generate("<Button-1>")
+    assert time.monotonic() - start < 5
+    assert "\nhello\nThe process completed successfully." in get_output()
+    assert "Killed" not in get_output()
+
+
+@pytest.mark.skipif(shutil.which("setsid") is None, reason="uses setsid")
+def test_stop_button_with_process_outside_process_group(tmp_path, wait_until):
+    # Stop button can't kill this process, and it keeps the output pipe open
+    no_terminal.run_command("echo hello; setsid sleep 10 &", tmp_path)
+    wait_until(lambda: "hello" in get_output())
+    wait_until(lambda: not no_terminal.runner.executor.running)
+
+    start = time.monotonic()
+    no_terminal.runner.stop_button.event_generate("<Button-1>")
+    assert time.monotonic() - start < 5
+    assert "\nhello\n" in get_output()
+    assert "Killed" not in get_output()
+
+
 def test_infinite_loop(tmp_path, wait_until):
     (tmp_path / "loop.py").write_text(
         """\
@@ -1,4 +1,5 @@
 import dataclasses
+import json
 import shutil
 import subprocess
 import sys
@@ -45,6 +46,28 @@ def test_bind_with_data_class():
     assert foo.num == 123
 
 
+# orjson is optional, and json.dumps() output must work too
+@pytest.mark.parametrize("message", ["abc", "é — ö", "\N{pile of poo}", "\udc80"])
+def test_event_dataclass_with_and_without_orjson(monkeypatch, message):
+    bar = Bar(foos=[Foo(message=message, num=123)])
+    orjson_installed = utils._HAS_ORJSON
+    with_orjson = str(bar)
+    monkeypatch.setattr(utils, "_HAS_ORJSON", False)
+    without_orjson = str(bar)
+
+    assert with_orjson.startswith("Bar{")
+    assert without_orjson.startswith("Bar{")
+    assert json.loads(with_orjson[3:]) == json.loads(without_orjson[3:])
+    assert "\N{pile of poo}" not in with_orjson
+
+    for has_orjson in [orjson_installed, False]:
+        monkeypatch.setattr(utils, "_HAS_ORJSON", has_orjson)
+        for string in [with_orjson, without_orjson]:
+            event = utils.EventWithData()
+            event.data_string = string
+            assert event.data_class(Bar) == bar
+
+
 if sys.platform == "darwin":
     binding_test_cases = [
         ("<<Menubar:Edit/Anchors/Add or remove on this line>>", "⇧⌃A", "Shift-Control-A"),
@@ -115,3 +138,12 @@ def test_format_command():
         assert utils.format_command(path + " {file}", {"file": "tetris.py"}) == [path, "tetris.py"]
     else:
         assert utils.format_command(r"foo\ bar", {}) == ["foo bar"]
+
+
+def test_tkinter_safe_string():
+    string = "".join(map(chr, range(0x10100))) + "a\N{pile of poo}b\U0010FFFF"
+    replaced = "".join("\N{replacement character}" if ord(c) > 0xFFFF else c for c in string)
+    hidden = "".join(c for c in string if ord(c) <= 0xFFFF)
+
+    assert utils.tkinter_safe_string(string) == replaced
+    assert utils.tkinter_safe_string(string, hide_unsupported_chars=True) == hidden